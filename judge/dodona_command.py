@@ -1,15 +1,72 @@
 """Report judge's results to Dodona using Dodona commands (partial JSON output)."""
 
+import atexit
 import json
 import sys
-from abc import ABC
-from enum import Enum
-from types import SimpleNamespace, TracebackType
-from typing import Any, Optional, Union
+from types import TracebackType
+from typing import Any, ClassVar, Optional, Union
 
+try:
+    import orjson
 
-class ErrorType(str, Enum):
-    """Dodona error type."""
+    def _json_dumps(args: dict) -> str:
+        """Serialize a dict to a compact JSON string using orjson."""
+        return orjson.dumps(args, default=str).decode("utf-8")
+
+except ImportError:
+
+    def _json_dumps(args: dict) -> str:
+        """Serialize a dict to a compact JSON string using the stdlib json module.
+
+        The compact separators and ensure_ascii=False keep the output
+        byte-identical to orjson's.
+        """
+        return json.dumps(args, default=str, separators=(",", ":"), ensure_ascii=False)
+
+# Commands are gathered here and written to stdout in large chunks, instead of
+# performing two small writes (payload + newline) for every 'with' block.
+_FLUSH_THRESHOLD = 64 * 1024
+
+_output_buffer: list[str] = []
+_output_buffer_size: int = 0
+
+
+def _flush_output() -> None:
+    """Write all buffered command fragments to stdout."""
+    global _output_buffer_size  # noqa: W0603
+    if _output_buffer:
+        sys.stdout.write("".join(_output_buffer))
+        _output_buffer.clear()
+        _output_buffer_size = 0
+
+
+def _write_output(*fragments: str) -> None:
+    """Buffer command fragments, flushing once the buffer grows large.
+
+    The fragments are buffered as-is and only joined during a flush, so no
+    intermediate concatenated strings are allocated per command.
+
+    Args:
+        *fragments: string fragments to write to stdout
+    """
+    global _output_buffer_size  # noqa: W0603
+    _output_buffer.extend(fragments)
+    _output_buffer_size += sum(map(len, fragments))
+    if _output_buffer_size >= _FLUSH_THRESHOLD:
+        _flush_output()
+
+
+# Make sure no output is lost if the judge exits outside a Judgement block.
+atexit.register(_flush_output)
+
+
+class ErrorType:  # noqa: R0903
+    """Dodona error type.
+
+    The types are used only as string payloads in the JSON output, so they are
+    plain class constants instead of an Enum: this avoids the descriptor
+    machinery on every attribute access.
+    """
 
     INTERNAL_ERROR = "internal error"
     COMPILATION_ERROR = "compilation error"
@@ -22,32 +79,16 @@ class ErrorType(str, Enum):
     CORRECT = "correct"
     CORRECT_ANSWER = "correct answer"
 
-    def __str__(self) -> str:  # noqa: E0307
-        """Convert enum to string.
-
-        Returns:
-            string representation of enum
-        """
-        return self
-
 
-class MessagePermission(str, Enum):
+class MessagePermission:  # noqa: R0903
     """Dodona permission for a message."""
 
     STUDENT = "student"
     STAFF = "staff"
     ZEUS = "zeus"
 
-    def __str__(self) -> str:  # noqa: E0307
-        """Convert enum to string.
-
-        Returns:
-            string representation of enum
-        """
-        return self
-
 
-class MessageFormat(str, Enum):
+class MessageFormat:  # noqa: R0903
     """Dodona format for a message."""
 
     PLAIN = "plain"
@@ -61,30 +102,14 @@ class MessageFormat(str, Enum):
     CODE = "code"
     PYTHON = "python"
 
-    def __str__(self) -> str:  # noqa: E0307
-        """Convert enum to string.
-
-        Returns:
-            string representation of enum
-        """
-        return self
-
 
-class AnnotationSeverity(str, Enum):
+class AnnotationSeverity:  # noqa: R0903
     """Dodona severity of an annotation."""
 
     ERROR = "error"
     WARNING = "warning"
     INFO = "info"
 
-    def __str__(self) -> str:  # noqa: E0307
-        """Convert enum to string.
-
-        Returns:
-            string representation of enum
-        """
-        return self
-
 
 class DodonaException(Exception):
     """Exception that will automatically create a message and set the correct status when thrown.
@@ -122,9 +147,12 @@ class DodonaException(Exception):
         self.message = Message(**kwargs) if len(kwargs) > 0 else None
 
 
-class DodonaCommand(ABC):
+class DodonaCommand:
     """Abstract class, parent of all Dodona commands.
 
+    The class is not an abc.ABC on purpose: ABCMeta's __instancecheck__ would
+    slow down the isinstance() call on every exception recovery path.
+
     This class provides all shared functionality for the Dodona commands. These commands
     should be used in a Python 'with' block.
 
@@ -142,7 +170,7 @@ class DodonaCommand(ABC):
         >>> with Tab(
         ...     title="example tab",
         ... ) as tab:
-        ...     tab.badgeCount = 43
+        ...     tab["badgeCount"] = 43
 
     When entering the 'with' block, prints:
     {
@@ -157,14 +185,41 @@ class DodonaCommand(ABC):
     }
     """
 
+    _cmd_name: ClassVar[str] = "dodonacommand"
+    _start_cmd: ClassVar[str] = "start-dodonacommand"
+    _close_cmd: ClassVar[Optional[str]] = "close-dodonacommand"
+    _start_prefix: ClassVar[str] = '{"command":"start-dodonacommand"'
+    _close_prefix: ClassVar[Optional[str]] = '{"command":"close-dodonacommand"'
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Cache the command strings used in the start and close messages.
+
+        Subclasses can override '_start_cmd' or '_close_cmd' in their class
+        body (eg. Message prints "append-message" commands, and a '_close_cmd'
+        of None suppresses the close message). The '{"command": ...}' prefix of
+        each message is serialized once here, so emitting a message only has to
+        serialize its arguments.
+
+        Args:
+            **kwargs: named arguments passed to the parent hook
+        """
+        super().__init_subclass__(**kwargs)
+        cls._cmd_name = cls.__name__.lower()
+        if "_start_cmd" not in cls.__dict__:
+            cls._start_cmd = f"start-{cls._cmd_name}"
+        if "_close_cmd" not in cls.__dict__:
+            cls._close_cmd = f"close-{cls._cmd_name}"
+        cls._start_prefix = f'{{"command":"{cls._start_cmd}"'
+        cls._close_prefix = f'{{"command":"{cls._close_cmd}"' if cls._close_cmd is not None else None
+
     def __init__(self, **kwargs: Any) -> None:
         """Create DodonaCommand.
 
         Args:
             **kwargs: dict that is JSON encoded and printed when entering the 'with' block
         """
-        self.start_args = SimpleNamespace(**kwargs)
-        self.close_args = SimpleNamespace()
+        self.start_args: dict[str, Any] = kwargs
+        self.close_args: dict[str, Any] = {}
 
     def name(self) -> str:
         """Get name used in start and close messages, defaults to the lowercase version of the classname.
@@ -172,23 +227,27 @@ class DodonaCommand(ABC):
         Returns:
             name
         """
-        return self.__class__.__name__.lower()
-
-    def start_msg(self) -> dict:
-        """Create start message that is printed as JSON to stdout when entering the 'with' block.
+        return self._cmd_name
 
-        Returns:
-            start message
-        """
-        return {"command": f"start-{self.name()}", **self.start_args.__dict__}
+    @staticmethod
+    def __print_fragments(prefix: Optional[str], args: dict) -> None:
+        """Print a message to stdout as JSON, given its pre-serialized command prefix.
 
-    def close_msg(self) -> Optional[dict]:
-        """Create close message that is printed as JSON to stdout when exiting the 'with' block.
+        The '{"command": ...}' prefix is already serialized (once per class), so
+        only the message arguments are JSON encoded here and spliced in behind it.
 
-        Returns:
-            close message
+        Args:
+            prefix: pre-serialized message prefix, or None to print nothing
+            args: message arguments that are JSON encoded and appended to the prefix
         """
-        return {"command": f"close-{self.name()}", **self.close_args.__dict__}
+        if prefix is None:
+            return
+        if not args:
+            _write_output(prefix, "}\n")
+            return
+        body = _json_dumps(args)
+        # Replace the leading '{' of the serialized arguments with the prefix.
+        _write_output(prefix, ",", body[1:], "\n")
 
     @staticmethod
     def __print_command(result: Optional[dict]) -> None:
@@ -199,17 +258,15 @@ class DodonaCommand(ABC):
         """
         if result is None:
             return
-        json.dump(result, sys.stdout, indent=1, sort_keys=True)
-        sys.stdout.write("\n")  # Next JSON fragment should be on new line
+        _write_output(_json_dumps(result) + "\n")  # Next JSON fragment should be on new line
 
-    def __enter__(self) -> SimpleNamespace:
+    def __enter__(self) -> dict[str, Any]:
         """Print the start message when entering the 'with' block.
 
         Returns:
-            SimpleNamespace object that can be used to dynamically create the
-            close message
+            dict that can be used to dynamically create the close message
         """
-        self.__print_command(self.start_msg())
+        self.__print_fragments(self._start_prefix, self.start_args)
         return self.close_args
 
     def handle_dodona_exception(self, exception: DodonaException) -> bool:
@@ -279,7 +336,7 @@ class DodonaCommand(ABC):
         else:
             handled = False
 
-        self.__print_command(self.close_msg())
+        self.__print_fragments(self._close_prefix, self.close_args)
         return handled
 
 
@@ -296,7 +353,7 @@ class DodonaCommandWithAccepted(DodonaCommand):
             if True, the exception is not propagated
         """
         accepted = exception.status["enum"] == ErrorType.CORRECT or exception.status["enum"] == ErrorType.CORRECT_ANSWER
-        self.close_args.accepted = accepted
+        self.close_args["accepted"] = accepted
 
         return super().handle_dodona_exception(exception)
 
@@ -313,7 +370,7 @@ class DodonaCommandWithStatus(DodonaCommandWithAccepted):
         Returns:
             if True, the exception is not propagated
         """
-        self.close_args.status = exception.status
+        self.close_args["status"] = exception.status
 
         return super().handle_dodona_exception(exception)
 
@@ -321,6 +378,26 @@ class DodonaCommandWithStatus(DodonaCommandWithAccepted):
 class Judgement(DodonaCommandWithStatus):
     """Dodona Judgement."""
 
+    def __exit__(
+        self,
+        exc_type: type[BaseException],
+        exc_val: BaseException,
+        exc_tb: TracebackType,
+    ) -> bool:
+        """Flush all buffered output once the judgement is complete.
+
+        Args:
+            exc_type: exception type
+            exc_val: exception value
+            exc_tb: exception traceback
+
+        Returns:
+            if True, the exception is not propagated
+        """
+        handled = super().__exit__(exc_type, exc_val, exc_tb)
+        _flush_output()
+        return handled
+
 
 class Tab(DodonaCommand):
     """Dodona Tab."""
@@ -392,6 +469,11 @@ class Test(DodonaCommandWithStatus):
 class Message(DodonaCommand):
     """Dodona Message."""
 
+    # A Message prints an "append-message" command when entering the 'with' block
+    # and nothing when exiting it.
+    _start_cmd: ClassVar[str] = "append-message"
+    _close_cmd: ClassVar[Optional[str]] = None
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         """Create Message.
 
@@ -424,21 +506,15 @@ class Message(DodonaCommand):
         else:
             super().__init__(message=kwargs)
 
-    def start_msg(self) -> dict:
-        """Print the "append-message" command and parameters when entering the 'with' block.
-
-        Returns:
-            start message that will be JSON encoded and printed to stdout
-        """
-        return {"command": "append-message", **self.start_args.__dict__}
-
-    def close_msg(self) -> None:
-        """Don't print anything when exiting the 'with' block."""
-
 
 class Annotation(DodonaCommand):
     """Dodona Annotation."""
 
+    # An Annotation prints an "annotate-code" command when entering the 'with' block
+    # and nothing when exiting it.
+    _start_cmd: ClassVar[str] = "annotate-code"
+    _close_cmd: ClassVar[Optional[str]] = None
+
     def __init__(self, row: int, text: str, **kwargs: Any) -> None:
         """Create Annotation.
 
@@ -448,14 +524,3 @@ class Annotation(DodonaCommand):
             **kwargs: additional named arguments
         """
         super().__init__(row=row, text=text, **kwargs)
-
-    def start_msg(self) -> dict:
-        """Print the "annotate-code" command and parameters when entering the 'with' block.
-
-        Returns:
-            start message that will be JSON encoded and printed to stdout
-        """
-        return {"command": "annotate-code", **self.start_args.__dict__}
-
-    def close_msg(self) -> None:
-        """Don't print anything when exiting the 'with' block."""
@@ -1,16 +1,12 @@
 """Turtle runtime patches."""
 
 import sys
-from abc import ABC
-from io import StringIO
+from io import BytesIO, TextIOWrapper
 from types import TracebackType
 from typing import Any, Literal
 
-from svg_turtle import SvgTurtle  # noqa
-from svg_turtle.canvas import Canvas  # noqa
 
-
-class Patch(ABC):
+class Patch:
     """A patch helper class that allows to enter and exit a patch."""
 
     def __init__(self):
@@ -45,6 +41,28 @@ class Patch(ABC):
         return False  # don't handle any errors
 
 
+# Screens are pooled per canvas size: reusing the already-allocated screen and
+# canvas buffers skips their construction on every run after the first within
+# the same worker process.
+_screen_pool: dict[tuple[int, int], Any] = {}
+
+
+def _reset_screen(screen: Any) -> None:
+    """Reset a pooled screen to its freshly-constructed state.
+
+    No state a previous run left behind (colormode, tracer, registered shapes,
+    drawn items, ...) may leak into the next one. Deliberately re-running
+    __init__ on the existing canvas resets everything exactly like a fresh
+    screen, while still reusing the allocated canvas buffers.
+
+    Args:
+        screen: pooled screen to reset
+    """
+    screen.cv.items.clear()
+    screen.cv.max_zorder = 0
+    screen.__init__(screen.cv)  # noqa: C2801
+
+
 class TurtlePatch(Patch):  # noqa: R0903
     """Patch the turtle module."""
 
@@ -55,13 +73,24 @@ class TurtlePatch(Patch):  # noqa: R0903
 
     def patch(self):
         """Patch generator."""
+        # svg_turtle is imported lazily: it is only needed once student code
+        # actually runs, not when the judge exits early on config errors.
+        from svg_turtle import SvgTurtle  # noqa
+        from svg_turtle.canvas import Canvas  # noqa
+
         turtle_mod = sys.modules["turtle"]
 
         old_mainloop = turtle_mod.mainloop
         old_done = turtle_mod.done
         old_turtle = turtle_mod.Turtle
         try:
-            screen = SvgTurtle._Screen(Canvas(self.width, self.height))  # noqa: W0212
+            pool_key = (self.width, self.height)
+            screen = _screen_pool.get(pool_key)
+            if screen is None:
+                screen = SvgTurtle._Screen(Canvas(self.width, self.height))  # noqa: W0212
+                _screen_pool[pool_key] = screen
+            else:
+                _reset_screen(screen)
             screen.cv.config(bg="")
             screen.setworldcoordinates(
                 -(screen.window_width() / 2) + 0.5,
@@ -104,6 +133,16 @@ class TimePatch(Patch):  # noqa: R0903
             time_module.sleep = old_sleep
 
 
+def _capture_stream() -> TextIOWrapper:
+    """Create a text stream that swallows writes into a bytes buffer.
+
+    A TextIOWrapper around BytesIO encodes through its C-level buffer, avoiding
+    the Python-level unicode buffer resizing StringIO incurs when student code
+    prints a lot. Reading from the (empty) stream gives EOF, like StringIO did.
+    """
+    return TextIOWrapper(BytesIO(), encoding="utf-8", newline="", write_through=True)
+
+
 class InOutPatch(Patch):  # noqa: R0903
     """Patch stdin, stdout, stderr."""
 
@@ -112,7 +151,7 @@ class InOutPatch(Patch):  # noqa: R0903
         old_in, old_out, old_err = sys.stdin, sys.stdout, sys.stderr
         __old_in__, __old_out__, __old_err__ = sys.__stdin__, sys.__stdout__, sys.__stderr__
         try:
-            sys.stdin, sys.stdout, sys.stderr = StringIO(), StringIO(), StringIO()
+            sys.stdin, sys.stdout, sys.stderr = _capture_stream(), _capture_stream(), _capture_stream()
             __old_in__, __old_out__, __old_err__ = sys.stdin, sys.stdout, sys.stderr
             yield sys.stdin, sys.stdout, sys.stderr
         finally:
@@ -56,22 +56,22 @@ class Translator:
         # default value is EN
         return cls(cls.Language.EN)
 
-    def human_error(self, error: ErrorType) -> str:
-        """Translate an ErrorType enum into a human-readable string.
+    def human_error(self, error: str) -> str:
+        """Translate an ErrorType constant into a human-readable string.
 
         Args:
-            error: ErrorType enum
+            error: ErrorType constant
 
         Returns:
             translated human-readable string
         """
         return self.error_translations[self.language][error]
 
-    def error_status(self, error: ErrorType) -> dict[str, str]:
-        """Translate an ErrorType enum into a status object.
+    def error_status(self, error: str) -> dict[str, str]:
+        """Translate an ErrorType constant into a status object.
 
         Args:
-            error: ErrorType enum
+            error: ErrorType constant
 
         Returns:
             Dodona status object
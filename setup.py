@@ -0,0 +1,23 @@
+"""Optional build script that compiles the Dodona command hot path with Cython.
+
+The judge runs fine as pure Python; this build is purely an opt-in speedup.
+Running
+
+    python setup.py build_ext --inplace
+
+compiles judge/dodona_command.py (in Cython's pure-Python mode) to an extension
+module that shadows the .py file and removes interpreter dispatch overhead on
+the 'with' block enter/exit path, which is hit twice for every emitted command.
+"""
+
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+
+setup(
+    name="judge-turtle",
+    ext_modules=cythonize(["judge/dodona_command.py"], language_level=3) if cythonize is not None else [],
+)
@@ -27,24 +27,24 @@ class TestDodonaCommand(unittest.TestCase):
             CommandTestCase(
                 format=MessageFormat.PYTHON,
                 description="test",
-            ).start_args.__dict__,
+            ).start_args,
             CommandTestCase(
                 {
                     "format": MessageFormat.PYTHON,
                     "description": "test",
                 }
-            ).start_args.__dict__,
+            ).start_args,
         )
 
         self.assertDictEqual(
             CommandMessage(
                 format=MessageFormat.PYTHON,
                 description="test",
-            ).start_args.__dict__,
+            ).start_args,
             CommandMessage(
                 {
                     "format": MessageFormat.PYTHON,
                     "description": "test",
                 }
-            ).start_args.__dict__,
+            ).start_args,
         )
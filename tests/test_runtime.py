@@ -0,0 +1,35 @@
+"""Test Runtime."""
+
+import tempfile
+import unittest
+
+from judge.runtime import generate_svg_byte_stream
+
+
+class TestRuntime(unittest.TestCase):
+    """Runtime TestCase."""
+
+    @staticmethod
+    def run_script(source: str) -> bytes:
+        with tempfile.NamedTemporaryFile("w", suffix=".py") as script:
+            script.write(source)
+            script.flush()
+            return generate_svg_byte_stream(script.name, 100, 100)
+
+    def test_pooled_screen_reset(self):
+        """A run that mutates screen state may not affect the next run."""
+        plain_script = "import turtle\n" "t = turtle.Turtle()\n" "t.pencolor((1.0, 0.0, 0.0))\n" "t.forward(50)\n"
+        mutating_script = (
+            "import turtle\n"
+            "t = turtle.Turtle()\n"
+            "t.getscreen().colormode(255)\n"
+            "t.getscreen().bgcolor('blue')\n"
+            "t.pencolor((255, 0, 0))\n"
+            "t.forward(25)\n"
+        )
+
+        first_svg = self.run_script(plain_script)
+        self.run_script(mutating_script)
+        second_svg = self.run_script(plain_script)
+
+        self.assertEqual(first_svg, second_svg)
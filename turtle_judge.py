@@ -16,7 +16,12 @@ from judge.dodona_command import (
     TestCase,
 )
 from judge.dodona_config import DodonaConfig
-from judge.runtime import diff_images, generate_png_image, generate_svg_byte_stream
+from judge.runtime import (
+    count_visible_pixels,
+    diff_images,
+    generate_cached_svg_and_image,
+    generate_svg_and_image,
+)
 from judge.translator import Translator
 
 # extract info from exercise configuration
@@ -33,6 +38,11 @@ with Judgement():
     # Set 'canvas_height' to 250 if not set
     config.canvas_height = int(getattr(config, "canvas_height", "250"))
 
+    # Set 'solution_cache' to False if not set. The on-disk solution cache is
+    # opt-in: submitted code runs in-process, so exercises should only enable
+    # it on hosts where poisoning the shared cache dir is not a concern.
+    config.solution_cache = str(getattr(config, "solution_cache", False)).lower() == "true"
+
     # Set 'solution_file' to "./solution.py" if not set
     config.solution_file = str(getattr(config, "solution_file", "./solution.py"))
     config.solution_file = os.path.join(config.resources, config.solution_file)
@@ -51,7 +61,9 @@ with Judgement():
             description="",
         ):
             try:
-                svg_submission = generate_svg_byte_stream(config.source, config.canvas_width, config.canvas_height)
+                svg_submission, png_submission = generate_svg_and_image(
+                    config.source, config.canvas_width, config.canvas_height
+                )
             except BaseException as error:
                 raise DodonaException(
                     config.translator.error_status(ErrorType.COMPILATION_ERROR),
@@ -59,7 +71,11 @@ with Judgement():
                     format=MessageFormat.CODE,
                 ) from error
             try:
-                svg_solution = generate_svg_byte_stream(config.solution_file, config.canvas_width, config.canvas_height)
+                # The solution is stable per exercise, so its renders can be cached across submissions.
+                render_solution = generate_cached_svg_and_image if config.solution_cache else generate_svg_and_image
+                svg_solution, png_solution = render_solution(
+                    config.solution_file, config.canvas_width, config.canvas_height
+                )
             except BaseException as error:
                 raise DodonaException(
                     config.translator.error_status(ErrorType.COMPILATION_ERROR),
@@ -68,10 +84,12 @@ with Judgement():
                     format=MessageFormat.CODE,
                 ) from error
 
-            png_submission = generate_png_image(svg_submission, config.canvas_width, config.canvas_height)
-            png_solution = generate_png_image(svg_solution, config.canvas_width, config.canvas_height)
-
-            correct_pixels, total_pixels, expected_total = diff_images(png_submission, png_solution)
+            if svg_submission == svg_solution:
+                # Identical SVG output renders to identical images, so the pixel diff can be skipped.
+                expected_total = count_visible_pixels(png_solution)
+                correct_pixels, total_pixels = expected_total, expected_total
+            else:
+                correct_pixels, total_pixels, expected_total = diff_images(png_submission, png_solution)
 
             # base64_submission = base64.b64encode(svg_submission).decode("utf-8")
             # base64_solution = base64.b64encode(svg_solution).decode("utf-8")
@@ -102,7 +120,7 @@ with Judgement():
                     fraction=1,
                 ),
             ) as test:
-                test.generated = config.translator.translate(
+                test["generated"] = config.translator.translate(
                     Translator.Text.FOREGROUND_PIXELS_CORRECT,
                     correct_pixels=correct_pixels,
                     total_pixels=total_pixels,
@@ -110,6 +128,6 @@ with Judgement():
                 )
 
                 if correct_pixels < total_pixels:
-                    test.status = config.translator.error_status(ErrorType.WRONG)
+                    test["status"] = config.translator.error_status(ErrorType.WRONG)
                 else:
-                    test.status = config.translator.error_status(ErrorType.CORRECT)
+                    test["status"] = config.translator.error_status(ErrorType.CORRECT)